@@ -11,7 +11,7 @@ import logging
 from datetime import datetime
 from typing import Any, Dict
 
-from marshmallow import Schema, fields, post_load, pre_dump
+from marshmallow import EXCLUDE, Schema, fields, post_load, pre_dump
 
 from app.schemas.common_fields import CommonFields
 
@@ -40,7 +40,7 @@ class BaseSchema(Schema):
         """Schema metadata configuration."""
 
         # Include unknown fields in deserialization
-        unknown = "EXCLUDE"  # EXCLUDE, INCLUDE, or RAISE
+        unknown = EXCLUDE  # EXCLUDE, INCLUDE, or RAISE
         # Preserve field order
         ordered = True
         # Date format for datetime fields
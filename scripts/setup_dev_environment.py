@@ -12,6 +12,7 @@ Usage:
 
 import argparse
 import os
+import shutil
 import subprocess
 import sys
 from pathlib import Path
@@ -220,6 +221,21 @@ class DevEnvironmentSetup:
         print("✅ Production configuration validation completed")
         return True
     
+    def _is_tool_installed(self, tool: str) -> bool:
+        """Check whether a code quality tool's command is on PATH.
+
+        Uses ``shutil.which`` instead of running ``<tool> --version``, so no
+        process is spawned per tool while the check keeps its meaning: the
+        command can actually be run.
+
+        Args:
+            tool: Command name of the tool.
+
+        Returns:
+            True if the command is available, False otherwise.
+        """
+        return shutil.which(tool) is not None
+
     def validate_style_setup(self) -> bool:
         """Validate style guide tools and configurations.
         
@@ -240,13 +256,7 @@ class DevEnvironmentSetup:
         
         # Check tool installation
         tools = ['black', 'isort', 'flake8', 'mypy', 'pre-commit']
-        missing_tools = []
-        
-        for tool in tools:
-            try:
-                subprocess.run([tool, '--version'], capture_output=True, check=True)
-            except (subprocess.CalledProcessError, FileNotFoundError):
-                missing_tools.append(tool)
+        missing_tools = [tool for tool in tools if not self._is_tool_installed(tool)]
         
         if missing_tools:
             print(f"❌ Missing tools: {', '.join(missing_tools)}")
@@ -32,6 +32,14 @@ Usage:
     pytest -m unit
     pytest -m integration
 
+    # Run in parallel across CPU cores (requires pytest-xdist)
+    pytest -n auto tests/
+
+Parallel Execution:
+    Each pytest-xdist worker builds its own application and in-memory
+    database, and prefixes cache keys with its ``PYTEST_XDIST_WORKER`` id,
+    so workers never share database rows or cache entries.
+
 See AI_INSTRUCTIONS.md §7 for testing guidelines.
 """
 
@@ -4,69 +4,145 @@ Essential fixtures for testing Flask applications.
 """
 
 import os
-import tempfile
 from datetime import datetime
+from pathlib import Path
+from types import MappingProxyType
 from unittest.mock import Mock
 
 import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.pool import QueuePool
 
 from app import create_app
 from app.extensions import db as _db
 from tests import TEST_CONFIG
 
 
-# Simple test data
-TEST_USER_DATA = {
-    "id": 1,
-    "username": "testuser",
-    "email": "test@example.com",
-    "password": "testpassword123",
-}
+# Application config, built once at import. The named shared-cache in-memory
+# database is visible to every pooled connection in this process, while each
+# connection keeps its own transactions; it lives as long as the pool holds
+# a connection open.
+_BASE_TEST_CONFIG = MappingProxyType(
+    {
+        **TEST_CONFIG,
+        "SQLALCHEMY_DATABASE_URI": (
+            "sqlite:///file:testdb?mode=memory&cache=shared&uri=true"
+        ),
+        "SQLALCHEMY_ENGINE_OPTIONS": {
+            "connect_args": {"check_same_thread": False},
+            "poolclass": QueuePool,
+        },
+    }
+)
 
-TEST_POST_DATA = {
-    "id": 1,
-    "title": "Test Post",
-    "content": "Test content",
-    "user_id": 1,
-}
+# Simple test data (read-only; copy with dict() before mutating or sending
+# as json=, since MappingProxyType is not JSON serializable)
+TEST_USER_DATA = MappingProxyType(
+    {
+        "id": 1,
+        "username": "testuser",
+        "email": "test@example.com",
+        "password": "testpassword123",
+    }
+)
 
+TEST_POST_DATA = MappingProxyType(
+    {
+        "id": 1,
+        "title": "Test Post",
+        "content": "Test content",
+        "user_id": 1,
+    }
+)
 
-@pytest.fixture(scope="session")
-def app():
-    """Create Flask application for testing.
+_SAMPLE_DATA = MappingProxyType({"user": TEST_USER_DATA, "post": TEST_POST_DATA})
 
-    Returns:
-        Flask: Configured Flask application instance
+
+def _xdist_worker_id():
+    """Return the current pytest-xdist worker id ("master" when not distributed)."""
+    return os.environ.get("PYTEST_XDIST_WORKER", "master")
+
+
+def _is_xdist_controller(config):
+    """Return True in the pytest-xdist controller process, which runs no tests."""
+    return bool(getattr(config.option, "numprocesses", None)) and (
+        "PYTEST_XDIST_WORKER" not in os.environ
+    )
+
+
+def pytest_sessionstart(session):
+    """Create the Flask application and its tables once, before collection.
+
+    No application context is left pushed; each test gets its own from
+    ``app_ctx``. The xdist controller skips the build since only the
+    workers run tests.
     """
-    # Create temporary database file
-    db_fd, db_path = tempfile.mkstemp()
+    if _is_xdist_controller(session.config):
+        return
 
-    # Update test config with temporary database
-    test_config = TEST_CONFIG.copy()
-    test_config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{db_path}"
+    test_config = dict(_BASE_TEST_CONFIG)
+    test_config["CACHE_KEY_PREFIX"] = f"test_{_xdist_worker_id()}_"
 
-    # Create app with test configuration
+    # Create app with test configuration; each xdist worker gets its own
+    # in-memory database and cache key prefix
     app = create_app(test_config)
 
-    # Establish application context
     with app.app_context():
-        # Create all database tables
         _db.create_all()
 
-        yield app
+    session.config._flask_app = app
+
 
-        # Cleanup
+def pytest_sessionfinish(session, exitstatus):
+    """Drop the test database tables."""
+    app = getattr(session.config, "_flask_app", None)
+    if app is None:
+        return
+
+    with app.app_context():
         _db.drop_all()
+    del session.config._flask_app
 
-    # Close and remove temporary database file
-    os.close(db_fd)
-    os.unlink(db_path)
+
+@pytest.fixture(scope="session")
+def app(request):
+    """Flask application for testing, created in ``pytest_sessionstart``.
+
+    Returns:
+        Flask: Configured Flask application instance
+    """
+    return request.config._flask_app
+
+
+@pytest.fixture(scope="function", autouse=True)
+def app_ctx(request):
+    """Push a fresh application context for every test.
+
+    The application is shared by the whole session, but ``g`` and the
+    Flask-SQLAlchemy scoped session live on the context, so popping it
+    after each test keeps that state from leaking into the next one.
+
+    The app is read from the config rather than requested as the ``app``
+    fixture: pytest-flask pushes a request context into every test that
+    uses ``app``, which would break tests that run outside a request.
+
+    Yields:
+        AppContext: The context pushed for the current test
+    """
+    with request.config._flask_app.app_context() as ctx:
+        yield ctx
 
 
 @pytest.fixture(scope="function")
 def client(app):
     """Create test client for making HTTP requests.
 
+    The application is built once per session and each test runs in its
+    own application context (see ``app_ctx``). The client is not entered
+    as a context manager because preserved request contexts cannot be
+    popped after threaded requests.
+
     Args:
         app: Flask application fixture
 
@@ -76,14 +152,74 @@ def client(app):
     return app.test_client()
 
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="session")
 def db(app):
-    """Create database instance for testing."""
-    with app.app_context():
-        _db.create_all()
-        yield _db
-        _db.session.remove()
-        _db.drop_all()
+    """Database instance for testing.
+
+    Tables are created once at session start; use the ``session``
+    fixture to isolate writes made by a single test.
+    """
+    return _db
+
+
+@pytest.fixture(scope="function")
+def session(db):
+    """Database session wrapped in a transaction that is rolled back after the test.
+
+    The session joins an external transaction and turns its own ``commit()``
+    calls into SAVEPOINT releases, so tests may commit freely without
+    leaking rows into other tests.
+
+    Yields:
+        scoped_session: Session bound to the per-test connection
+    """
+    connection = db.engine.connect()
+    restore_driver_transactions = _take_over_sqlite_transactions(connection)
+    transaction = connection.begin()
+    original_session = db.session
+    test_session = scoped_session(
+        sessionmaker(bind=connection, join_transaction_mode="create_savepoint")
+    )
+    db.session = test_session
+
+    yield test_session
+
+    test_session.remove()
+    db.session = original_session
+    transaction.rollback()
+    restore_driver_transactions()
+    connection.close()
+
+
+def _take_over_sqlite_transactions(connection):
+    """Let SQLAlchemy control SQLite transactions so SAVEPOINTs roll back cleanly.
+
+    pysqlite begins transactions lazily on its own, which breaks the
+    rollback of an enclosing transaction. Following the SQLAlchemy docs
+    recipe, driver-level transaction handling is disabled for this one
+    connection and ``BEGIN`` is emitted explicitly instead.
+
+    Returns:
+        callable: Restores the driver behaviour before the connection is
+        returned to the pool
+    """
+    if connection.dialect.name != "sqlite":
+        return lambda: None
+
+    dbapi_connection = connection.connection.dbapi_connection
+    isolation_level = dbapi_connection.isolation_level
+    dbapi_connection.isolation_level = None
+
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    event.listen(connection, "begin", _emit_begin)
+
+    def restore():
+        event.remove(connection, "begin", _emit_begin)
+        dbapi_connection.isolation_level = isolation_level
+
+    return restore
 
 
 @pytest.fixture(scope="function")
@@ -94,19 +230,39 @@ def auth_headers():
 
 @pytest.fixture(scope="session")
 def sample_data():
-    """Sample data for testing."""
-    return {
-        "user": TEST_USER_DATA,
-        "post": TEST_POST_DATA,
-    }
+    """Sample data for testing (read-only, shared across the session).
+
+    Pass ``dict(sample_data["user"])`` rather than the entry itself as
+    ``json=`` to the test client.
+    """
+    return _SAMPLE_DATA
+
+
+# Pytest configuration (markers are registered in pyproject.toml)
+
 
+_TESTS_DIR_PARTS = Path(__file__).parent.parts
+
+# Marker applied to every test under the matching tests/<directory>/
+_DIRECTORY_MARKERS = {
+    "unit": pytest.mark.unit,
+    "integration": pytest.mark.integration,
+    "performance": pytest.mark.performance,
+}
 
-# Pytest configuration
 
+def pytest_collection_modifyitems(config, items):
+    """Mark collected tests by their top-level directory under ``tests/``.
+
+    Only the path component directly below ``tests/`` is looked up, so each
+    item costs a single dict lookup instead of substring scans of its path.
+    """
+    depth = len(_TESTS_DIR_PARTS)
+    for item in items:
+        parts = item.path.parts
+        if len(parts) <= depth + 1 or parts[:depth] != _TESTS_DIR_PARTS:
+            continue
 
-def pytest_configure(config):
-    """Configure pytest with custom markers."""
-    config.addinivalue_line("markers", "unit: mark test as a unit test")
-    config.addinivalue_line("markers", "integration: mark test as an integration test")
-    config.addinivalue_line("markers", "api: mark test as an API test")
-    config.addinivalue_line("markers", "slow: mark test as slow running")
\ No newline at end of file
+        marker = _DIRECTORY_MARKERS.get(parts[depth])
+        if marker is not None:
+            item.add_marker(marker)
@@ -1,31 +1,17 @@
 """Application fixtures for testing.
 
 Basic fixtures for Flask application testing.
+
+The ``app``, ``client`` and ``db`` fixtures are defined once in
+``tests/conftest.py`` and are visible to every test, so only a single
+Flask application is built per test session (per worker under
+pytest-xdist).
 """
 
 import pytest
-from app import create_app
-from app.extensions import db
-
-
-@pytest.fixture
-def app():
-    """Create application for testing."""
-    app = create_app("testing")
-    
-    with app.app_context():
-        db.create_all()
-        yield app
-        db.drop_all()
-
-
-@pytest.fixture
-def client(app):
-    """Create test client."""
-    return app.test_client()
 
 
 @pytest.fixture
 def runner(app):
     """Create test CLI runner."""
-    return app.test_cli_runner()
\ No newline at end of file
+    return app.test_cli_runner()
@@ -1,34 +1,47 @@
 """Data fixtures for testing.
 
 Basic data fixtures for testing.
+
+The samples are built once at import and returned as read-only views, so
+session-scoped fixtures can share them safely. Copy with ``dict()`` before
+mutating or before passing one as ``json=`` to the test client, since
+``MappingProxyType`` is not JSON serializable.
 """
 
-import pytest
+from types import MappingProxyType
 
+import pytest
 
-@pytest.fixture
-def sample_data():
-    """Sample data for testing."""
-    return {
+_SAMPLE_DATA = MappingProxyType(
+    {
         "name": "Test Item",
         "description": "A test item for testing purposes",
-        "value": 42
+        "value": 42,
     }
+)
+
+_SAMPLE_LIST = (
+    MappingProxyType({"id": 1, "name": "Item 1"}),
+    MappingProxyType({"id": 2, "name": "Item 2"}),
+    MappingProxyType({"id": 3, "name": "Item 3"}),
+)
+
+_INVALID_DATA = MappingProxyType({"incomplete": "data"})
+
+
+@pytest.fixture(scope="session")
+def sample_data():
+    """Sample data for testing."""
+    return _SAMPLE_DATA
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_list():
     """Sample list data for testing."""
-    return [
-        {"id": 1, "name": "Item 1"},
-        {"id": 2, "name": "Item 2"},
-        {"id": 3, "name": "Item 3"}
-    ]
+    return _SAMPLE_LIST
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def invalid_data():
     """Invalid data for testing error cases."""
-    return {
-        "incomplete": "data"
-    }
\ No newline at end of file
+    return _INVALID_DATA
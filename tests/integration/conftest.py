@@ -0,0 +1,42 @@
+"""Integration test fixtures.
+
+Fixtures shared by the integration tests in this directory.
+"""
+
+import pytest
+from sqlalchemy import text
+
+from app.extensions import db
+
+# Ad-hoc tables used by the database integration tests
+_INTEGRATION_TABLES = (
+    """
+    CREATE TABLE IF NOT EXISTS test_integration (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS test_rollback (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS test_cache_db (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        value TEXT NOT NULL
+    )
+    """,
+)
+
+
+@pytest.fixture(scope="session")
+def integration_tables(app):
+    """Create the integration test tables once per test session."""
+    with app.app_context():
+        with db.engine.begin() as conn:
+            for ddl in _INTEGRATION_TABLES:
+                conn.execute(text(ddl))
@@ -4,8 +4,10 @@ This module tests the integration between different components
 of the application, including blueprints, database, and extensions.
 """
 
+from collections import Counter
+
 from flask import url_for
-from sqlalchemy import text
+from sqlalchemy import event, text
 
 from app.extensions import cache, db
 
@@ -30,34 +32,26 @@ class TestApplicationIntegration:
         # Should either work or return 404 if not implemented
         assert response.status_code in [200, 404]
 
-    def test_database_blueprint_integration(self, app, client):
+    def test_database_blueprint_integration(
+        self, app, client, integration_tables, session
+    ):
         """Test database operations through API endpoints."""
         with app.app_context():
-            # Create a test table
-            with db.engine.connect() as conn:
-                conn.execute(
-                    text("""
-                    CREATE TABLE IF NOT EXISTS test_integration (
-                        id INTEGER PRIMARY KEY,
-                        name TEXT NOT NULL,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """)
-                )
-
-                # Insert test data
-                conn.execute(
-                    text("INSERT INTO test_integration (name) VALUES (:name)"), {"name": "test_record"}
-                )
-
-                # Test that we can query through the application
-                result = conn.execute(
-                    text("SELECT * FROM test_integration WHERE name = :name"), {"name": "test_record"}
-                )
-                row = result.fetchone()
-                assert row is not None
-                assert row[1] == "test_record"  # name is the second column
-                conn.commit()
+            # Insert test data; the session fixture rolls it back afterwards
+            session.execute(
+                text("INSERT INTO test_integration (name) VALUES (:name)"),
+                {"name": "test_record"},
+            )
+
+            # Test that we can query through the application
+            result = session.execute(
+                text("SELECT * FROM test_integration WHERE name = :name"),
+                {"name": "test_record"},
+            )
+            row = result.fetchone()
+            assert row is not None
+            assert row[1] == "test_record"  # name is the second column
+            session.commit()
 
     def test_cache_blueprint_integration(self, app, client):
         """Test cache operations through API endpoints."""
@@ -123,22 +117,10 @@ class TestDatabaseIntegration:
             result = session1.execute(text("SELECT 1 as test"))
             assert result.fetchone()[0] == 1
 
-    def test_database_transaction_rollback(self, app):
+    def test_database_transaction_rollback(self, app, integration_tables):
         """Test database transaction rollback functionality."""
         with app.app_context():
             try:
-                # Create test table
-                with db.engine.connect() as conn:
-                    conn.execute(
-                        text("""
-                        CREATE TABLE IF NOT EXISTS test_rollback (
-                            id INTEGER PRIMARY KEY,
-                            name TEXT NOT NULL
-                        )
-                    """)
-                    )
-                    conn.commit()
-
                 # Start transaction
                 db.session.begin()
 
@@ -163,19 +145,47 @@ class TestDatabaseIntegration:
                 raise
 
     def test_database_connection_pooling(self, app):
-        """Test database connection pooling."""
+        """Test that connections are checked back in and reused, not reopened."""
         with app.app_context():
-            # Test multiple connections
-            connections = []
-            for i in range(5):
-                conn = db.engine.connect()
-                result = conn.execute(text("SELECT :value as test"), {"value": i})
-                assert result.fetchone()[0] == i
-                connections.append(conn)
+            engine = db.engine
+            pool_events = Counter()
+
+            def count(name):
+                def listener(*args):
+                    pool_events[name] += 1
 
-            # Close all connections
-            for conn in connections:
-                conn.close()
+                return listener
+
+            listeners = {
+                name: count(name) for name in ("connect", "checkout", "checkin")
+            }
+            for name, listener in listeners.items():
+                event.listen(engine, name, listener)
+
+            try:
+                # Warm the pool so a DBAPI connection already exists
+                with engine.connect():
+                    pass
+                pool_events.clear()
+
+                with engine.connect() as conn:
+                    rows = conn.execute(
+                        text("SELECT column1 FROM (VALUES (0), (1), (2), (3), (4))")
+                    ).fetchall()
+                    assert pool_events["checkin"] == 0
+
+                assert [row[0] for row in rows] == list(range(5))
+
+                with engine.connect():
+                    pass
+            finally:
+                for name, listener in listeners.items():
+                    event.remove(engine, name, listener)
+
+            # Both checkouts were served from the pool and returned to it
+            assert pool_events["checkout"] == 2
+            assert pool_events["checkin"] == 2
+            assert pool_events["connect"] == 0
 
 
 class TestCacheIntegration:
@@ -216,27 +226,15 @@ class TestCacheIntegration:
             cache.clear()
             assert cache.get("key2") is None
 
-    def test_cache_with_database(self, app):
+    def test_cache_with_database(self, app, integration_tables, session):
         """Test cache integration with database operations."""
         with app.app_context():
-            # Create test table
-            with db.engine.connect() as conn:
-                conn.execute(
-                    text("""
-                    CREATE TABLE IF NOT EXISTS test_cache_db (
-                        id INTEGER PRIMARY KEY,
-                        name TEXT NOT NULL,
-                        value TEXT NOT NULL
-                    )
-                """)
-                )
-
-                # Insert test data
-                conn.execute(
-                    text("INSERT INTO test_cache_db (name, value) VALUES (:name, :value)"),
-                    {"name": "test", "value": "database_value"},
-                )
-                conn.commit()
+            # Insert test data; the session fixture rolls it back afterwards
+            session.execute(
+                text("INSERT INTO test_cache_db (name, value) VALUES (:name, :value)"),
+                {"name": "test", "value": "database_value"},
+            )
+            session.commit()
 
             # Function that uses both cache and database
             def get_cached_value(name):
@@ -256,16 +254,16 @@ class TestCacheIntegration:
                     return cached
 
                 # Get from database
-                with db.engine.connect() as conn:
-                    result = conn.execute(
-                        text("SELECT value FROM test_cache_db WHERE name = :name"), {"name": name}
-                    )
-                    row = result.fetchone()
-                    if row:
-                        value = row[0]  # value is the first (and only) column
-                        # Cache the result
-                        cache.set(cache_key, value, timeout=60)
-                        return value
+                result = session.execute(
+                    text("SELECT value FROM test_cache_db WHERE name = :name"),
+                    {"name": name},
+                )
+                row = result.fetchone()
+                if row:
+                    value = row[0]  # value is the first (and only) column
+                    # Cache the result
+                    cache.set(cache_key, value, timeout=60)
+                    return value
                 return None
 
             # Test cache miss (first call)
@@ -0,0 +1,47 @@
+"""Performance test fixtures.
+
+Fixtures shared by the performance tests in this directory.
+"""
+
+import json
+import os
+
+import pytest
+
+# Existing GET routes warmed before any timing starts
+_WARMUP_ENDPOINTS = (
+    "/",
+    "/examples/",
+    "/examples/health",
+    "/api/info",
+)
+
+# JSON body for warming the POST-only /api/echo route
+_WARMUP_ECHO_BODY = json.dumps({"message": "warmup"})
+
+# Warmup depth per endpoint, tunable via the WARM_COUNT environment variable
+_WARM_COUNT = int(os.environ.get("WARM_COUNT", "20"))
+
+
+@pytest.fixture(scope="session")
+def warm_client(app):
+    """Test client whose routes have been warmed up once per session.
+
+    Hits each endpoint in _WARMUP_ENDPOINTS, and posts once to /api/echo,
+    WARM_COUNT times so first-request costs (lazy imports, route matching,
+    pool connects) fall outside the timed regions.
+
+    Args:
+        app: Flask application fixture
+
+    Returns:
+        FlaskClient: Warmed-up test client instance
+    """
+    client = app.test_client()
+    for _ in range(_WARM_COUNT):
+        for endpoint in _WARMUP_ENDPOINTS:
+            client.get(endpoint)
+        client.post(
+            "/api/echo", data=_WARMUP_ECHO_BODY, content_type="application/json"
+        )
+    return client
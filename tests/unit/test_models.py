@@ -153,62 +153,49 @@ class TestConcreteModel:
         """Test that concrete model has correct table name."""
         assert self.TestModel.__tablename__ == "test_models"
 
-    def test_model_database_operations(self, app, db):
+    def test_model_database_operations(self, session):
         """Test basic database operations with concrete model."""
-        with app.app_context():
-            # Create the table
-            db.create_all()
-
-            try:
-                # Create and save a model instance
-                model = self.TestModel()
-                db.session.add(model)
-                db.session.commit()
-
-                # Test that the model was saved with an ID
-                assert model.id is not None
-                assert isinstance(model.id, int)
-
-                # Test that timestamps were set
-                assert model.created_at is not None
-                assert model.updated_at is not None
-                assert isinstance(model.created_at, datetime)
-                assert isinstance(model.updated_at, datetime)
-
-            finally:
-                # Clean up
-                db.session.rollback()
-                db.drop_all()
-
-    def test_model_update_timestamp(self, app, db):
-        """Test that updated_at timestamp changes on update."""
-        with app.app_context():
-            db.create_all()
+        # Create the table inside the rolled-back test transaction
+        self.TestModel.__table__.create(session.connection())
+
+        # Create and save a model instance
+        model = self.TestModel()
+        session.add(model)
+        session.commit()
 
-            try:
-                # Create and save a model
-                model = self.TestModel()
-                db.session.add(model)
-                db.session.commit()
+        # Test that the model was saved with an ID
+        assert model.id is not None
+        assert isinstance(model.id, int)
+
+        # Test that timestamps were set
+        assert model.created_at is not None
+        assert model.updated_at is not None
+        assert isinstance(model.created_at, datetime)
+        assert isinstance(model.updated_at, datetime)
+
+    def test_model_update_timestamp(self, session):
+        """Test that updated_at timestamp changes on update."""
+        self.TestModel.__table__.create(session.connection())
 
-                original_updated_at = model.updated_at
+        # Create and save a model
+        model = self.TestModel()
+        session.add(model)
+        session.commit()
 
-                # Wait a small amount to ensure timestamp difference
-                import time
+        original_updated_at = model.updated_at
 
-                time.sleep(0.01)
+        # Wait a small amount to ensure timestamp difference
+        import time
 
-                # Update the model
-                model.created_at = datetime.utcnow()  # Trigger an update
-                db.session.commit()
+        time.sleep(0.01)
 
-                # Test that updated_at changed
-                assert model.updated_at != original_updated_at
-                assert model.updated_at > original_updated_at
+        # Update the model
+        model.created_at = datetime.utcnow()  # Trigger an update
+        session.commit()
 
-            finally:
-                db.session.rollback()
-                db.drop_all()
+        # Test that updated_at changed
+        assert model.updated_at != original_updated_at
+        assert model.updated_at > original_updated_at
 
 
     """
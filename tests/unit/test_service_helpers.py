@@ -7,7 +7,7 @@ from app.utils.service_helpers import (
     safe_execute,
     validate_required_fields,
 )
-from tests.fixtures.app_fixtures import app, client, runner
+from tests.fixtures.app_fixtures import runner
 from tests.fixtures.data_fixtures import sample_data
 
 